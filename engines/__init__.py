@@ -0,0 +1,6 @@
+"""
+Knapsack solver engines used by the grading tools.
+
+``reference`` holds the finished versions of the course solutions; the
+other modules are faster engines that are checked against it.
+"""
@@ -0,0 +1,154 @@
+"""
+Batched multi-instance solver
+
+Solves many small independent knapsacks at once. Instances are padded into
+a (batch × capacity) array and every item step runs for the whole batch as
+a handful of NumPy operations, so the Python-level loop is over item
+positions (≤ n) instead of over instances × items × capacities.
+
+Padding is masked out: missing items get an impossible weight and an
+instance only reads its answer at its own capacity. Instances are sorted by
+capacity before chunking so each chunk is padded to a similar width.
+
+Requires numpy.
+
+Usage:
+    python -m engines.batch
+"""
+
+import random
+import time
+
+import numpy as np
+
+from engines.reference import knapsack_optimized, knapsack_with_items
+
+
+def _solve_chunk(chunk, with_items):
+    """
+    Run the 1D-row update for a list of instances in lockstep.
+
+    Args:
+        chunk: list of (weights, values, capacity)
+        with_items: also reconstruct the selected items
+
+    Returns:
+        List of max values, or (max_value, selected_items) tuples
+    """
+    size = len(chunk)
+    n = max(len(weights) for weights, _, _ in chunk)
+    width = max(capacity for _, _, capacity in chunk) + 1
+
+    # Padding items weigh more than any capacity in the chunk, so they never fit
+    weight = np.full((size, n), width, dtype=np.int64)
+    value = np.zeros((size, n), dtype=np.int64)
+    capacity = np.empty(size, dtype=np.int64)
+    for b, (weights, values, cap) in enumerate(chunk):
+        weight[b, :len(weights)] = weights
+        value[b, :len(values)] = values
+        capacity[b] = cap
+
+    columns = np.arange(width)
+    rows = np.arange(size)[:, None]
+    dp = np.zeros((size, width), dtype=np.int64)
+    taken = np.zeros((n, size, width), dtype=bool) if with_items else None
+
+    for i in range(n):
+        # Row b reads dp[b, c - weight[b, i]]: a per-instance shifted row
+        source = columns - weight[:, i:i+1]
+        fits = source >= 0
+        include = np.where(fits, dp[rows, np.maximum(source, 0)] + value[:, i:i+1], -1)
+        better = include > dp
+        np.maximum(dp, include, out=dp)
+        if with_items:
+            taken[i] = better
+
+    answers = dp[np.arange(size), capacity].tolist()
+    if not with_items:
+        return answers
+
+    results = []
+    for b, (weights, _, cap) in enumerate(chunk):
+        selected = []
+        c = cap
+        for i in range(len(weights) - 1, -1, -1):
+            if taken[i, b, c]:
+                selected.append(i)
+                c -= weights[i]
+        selected.reverse()
+        results.append((answers[b], selected))
+    return results
+
+
+def knapsack_batch(instances, with_items=False, chunk_size=1024):
+    """
+    Solve a list of independent 0/1 Knapsack instances together.
+
+    Args:
+        instances: list of (weights, values, capacity) tuples
+        with_items: return (max_value, selected_items) like knapsack_with_items
+        chunk_size: instances solved per vectorized pass (bounds memory)
+
+    Returns:
+        List with one answer per instance, in input order
+    """
+    # Similar capacities in a chunk means little padding
+    order = sorted(range(len(instances)), key=lambda k: instances[k][2])
+    results = [None] * len(instances)
+
+    for start in range(0, len(order), chunk_size):
+        block = order[start:start + chunk_size]
+        answers = _solve_chunk([instances[k] for k in block], with_items)
+        for k, answer in zip(block, answers):
+            results[k] = answer
+    return results
+
+
+# ==================== BENCHMARK ====================
+
+def generate_instances(count, max_n=50, max_capacity=1000, seed=0):
+    """Random small instances: n ≤ max_n, capacity ≤ max_capacity."""
+    rng = random.Random(seed)
+    instances = []
+    for _ in range(count):
+        n = rng.randint(1, max_n)
+        capacity = rng.randint(1, max_capacity)
+        weights = [rng.randint(1, max(1, capacity // 4)) for _ in range(n)]
+        values = [rng.randint(1, 100) for _ in range(n)]
+        instances.append((weights, values, capacity))
+    return instances
+
+
+def benchmark(counts=(100, 1000, 4000)):
+    """Compare instances/second of knapsack_batch with a knapsack_optimized loop."""
+    print(f"{'instances':>10} {'loop inst/s':>12} {'batch inst/s':>13} {'speedup':>8}  match")
+    for count in counts:
+        instances = generate_instances(count, seed=count)
+
+        start = time.perf_counter()
+        expected = [knapsack_optimized(w, v, c) for w, v, c in instances]
+        loop_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        actual = knapsack_batch(instances)
+        batch_s = time.perf_counter() - start
+
+        print(f"{count:>10} {count / loop_s:>12.0f} {count / batch_s:>13.0f} "
+              f"{loop_s / batch_s:>7.1f}x  {'✓' if actual == expected else '✗'}")
+
+    # Item reconstruction costs an (n × batch × capacity) bool array
+    instances = generate_instances(500, seed=1)
+    start = time.perf_counter()
+    with_items = knapsack_batch(instances, with_items=True)
+    items_s = time.perf_counter() - start
+    valid = all(
+        value == knapsack_with_items(w, v, c)[0]
+        and sum(w[i] for i in items) <= c
+        and sum(v[i] for i in items) == value
+        for (w, v, c), (value, items) in zip(instances, with_items)
+    )
+    print(f"\nwith_items: {len(instances) / items_s:.0f} inst/s, selections {'valid ✓' if valid else 'INVALID ✗'}")
+
+
+if __name__ == '__main__':
+    benchmark()
@@ -0,0 +1,137 @@
+"""
+Multiple-choice (grouped) knapsack
+
+Items come in groups and at most one option may be picked from each group,
+e.g. one configuration per service. This builds on the 1D-row technique of
+knapsack_optimized: one row of best values per capacity, updated once per
+group instead of once per item.
+
+Each group update is a single vectorized step. Every option's candidate
+row (the current row shifted right by the option's weight, plus its value)
+is stacked into one (options × capacity) array and reduced with one max,
+so the Python loop only runs over groups. All candidates read the row from
+before the group, which is what keeps two options of the same group from
+being combined.
+
+Requires numpy.
+
+Usage:
+    python -m engines.grouped
+"""
+
+import random
+import time
+
+import numpy as np
+
+
+def knapsack_grouped(groups, capacity, with_choices=False):
+    """
+    Solve the multiple-choice knapsack: pick at most one option per group.
+
+    Args:
+        groups: list of groups, each a list of (weight, value) options
+        capacity: knapsack capacity
+        with_choices: also return the chosen option index per group
+
+    Returns:
+        Maximum value achievable, or (max_value, choices) where choices[g]
+        is the index of the option picked from group g, or None
+    """
+    columns = np.arange(capacity + 1)
+    dp = np.zeros(capacity + 1, dtype=np.int64)
+    picks = []
+
+    for options in groups:
+        if not options:
+            if with_choices:
+                picks.append(None)
+            continue
+        weight = np.array([w for w, _ in options], dtype=np.int64)[:, None]
+        value = np.array([v for _, v in options], dtype=np.int64)[:, None]
+
+        # Row k is dp shifted right by weight[k], plus value[k]; cells where
+        # the option doesn't fit get -1 so they never win
+        source = columns - weight
+        candidates = np.where(source >= 0, dp[np.maximum(source, 0)] + value, -1)
+        best = candidates.max(axis=0)
+        better = best > dp
+
+        if with_choices:
+            picks.append(np.where(better, candidates.argmax(axis=0), -1))
+        dp = np.where(better, best, dp)
+
+    max_value = int(dp[capacity])
+    if not with_choices:
+        return max_value
+
+    # Walk the groups backwards following the recorded picks
+    choices = [None] * len(groups)
+    c = capacity
+    for g in range(len(groups) - 1, -1, -1):
+        if picks[g] is None:
+            continue
+        k = int(picks[g][c])
+        if k >= 0:
+            choices[g] = k
+            c -= groups[g][k][0]
+    return max_value, choices
+
+
+def knapsack_grouped_loop(groups, capacity):
+    """
+    Plain-Python baseline: expand each group into its options and check
+    conflicts by only ever combining an option with the row from before
+    its group.
+    """
+    dp = [0] * (capacity + 1)
+    for options in groups:
+        prev = dp[:]
+        for w, v in options:
+            for c in range(capacity, w - 1, -1):
+                if prev[c - w] + v > dp[c]:
+                    dp[c] = prev[c - w] + v
+    return dp[capacity]
+
+
+# ==================== BENCHMARK ====================
+
+def generate_groups(count, options, max_weight=100, seed=0):
+    """
+    Random groups with a capacity of a quarter of the weight of picking one
+    average option from every group, so only some groups can be used.
+    """
+    rng = random.Random(seed)
+    groups = [
+        [(rng.randint(1, max_weight), rng.randint(1, 100)) for _ in range(rng.randint(1, options))]
+        for _ in range(count)
+    ]
+    one_per_group = sum(sum(w for w, _ in group) / len(group) for group in groups)
+    capacity = int(one_per_group) // 4
+    return groups, capacity
+
+
+def benchmark(shapes=((20, 5), (50, 10), (100, 20), (200, 40))):
+    """Time knapsack_grouped against the per-option loop and check answers and choices."""
+    print(f"{'groups':>7} {'options':>8} {'capacity':>9} {'loop ms':>10} {'vector ms':>10} {'speedup':>8}  match")
+    for count, options in shapes:
+        groups, capacity = generate_groups(count, options, seed=count)
+
+        start = time.perf_counter()
+        expected = knapsack_grouped_loop(groups, capacity)
+        loop_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        actual, choices = knapsack_grouped(groups, capacity, with_choices=True)
+        vector_ms = (time.perf_counter() - start) * 1000
+
+        picked = [groups[g][k] for g, k in enumerate(choices) if k is not None]
+        valid = (actual == expected
+                 and sum(w for w, _ in picked) <= capacity
+                 and sum(v for _, v in picked) == actual)
+        print(f"{count:>7} {options:>8} {capacity:>9} {loop_ms:>10.1f} {vector_ms:>10.1f} "
+              f"{loop_ms / vector_ms:>7.1f}x  {'✓' if valid else '✗'}")
+
+
+if __name__ == '__main__':
+    benchmark()
@@ -0,0 +1,108 @@
+"""
+Reference solutions for the 0/1 Knapsack challenge
+
+Completed versions of every function in knapsack_starter.py. The graders
+use these to compute expected answers and as the baseline for engine
+benchmarks.
+"""
+
+def knapsack_recursive(weights, values, n, capacity):
+    """Pure recursion: O(2^n) time."""
+    if n == 0 or capacity == 0:
+        return 0
+    
+    if weights[n-1] > capacity:
+        return knapsack_recursive(weights, values, n-1, capacity)
+    
+    exclude = knapsack_recursive(weights, values, n-1, capacity)
+    include = values[n-1] + knapsack_recursive(weights, values, n-1, capacity - weights[n-1])
+    return max(exclude, include)
+
+
+def knapsack_memo(weights, values, n, capacity, memo=None):
+    """Memoization (top-down DP): O(n × capacity) time and space."""
+    if memo is None:
+        memo = {}
+    
+    if (n, capacity) in memo:
+        return memo[(n, capacity)]
+    
+    if n == 0 or capacity == 0:
+        return 0
+    
+    if weights[n-1] > capacity:
+        result = knapsack_memo(weights, values, n-1, capacity, memo)
+    else:
+        exclude = knapsack_memo(weights, values, n-1, capacity, memo)
+        include = values[n-1] + knapsack_memo(weights, values, n-1, capacity - weights[n-1], memo)
+        result = max(exclude, include)
+    
+    memo[(n, capacity)] = result
+    return result
+
+
+def knapsack_tabulation(weights, values, capacity):
+    """Tabulation (bottom-up DP) with a (n+1) x (capacity+1) table."""
+    n = len(weights)
+    dp = [[0 for _ in range(capacity + 1)] for _ in range(n + 1)]
+    
+    for i in range(1, n + 1):
+        for w in range(capacity + 1):
+            dp[i][w] = dp[i-1][w]
+            if weights[i-1] <= w:
+                include_value = values[i-1] + dp[i-1][w - weights[i-1]]
+                dp[i][w] = max(dp[i][w], include_value)
+    
+    return dp[n][capacity]
+
+
+def knapsack_optimized(weights, values, capacity):
+    """Space-optimized single 1D array: O(capacity) space."""
+    dp = [0] * (capacity + 1)
+    
+    for i in range(len(weights)):
+        # Right to left so each item is used at most once
+        for w in range(capacity, weights[i] - 1, -1):
+            dp[w] = max(dp[w], values[i] + dp[w - weights[i]])
+    
+    return dp[capacity]
+
+
+def knapsack_two_rows(weights, values, capacity):
+    """Space-optimized with two alternating rows."""
+    n = len(weights)
+    prev = [0] * (capacity + 1)
+    curr = [0] * (capacity + 1)
+    
+    for i in range(1, n + 1):
+        for w in range(capacity + 1):
+            curr[w] = prev[w]
+            if weights[i-1] <= w:
+                include_value = values[i-1] + prev[w - weights[i-1]]
+                curr[w] = max(curr[w], include_value)
+        prev, curr = curr, prev
+    
+    return prev[capacity]
+
+
+def knapsack_with_items(weights, values, capacity):
+    """Returns (max_value, selected item indices) by backtracking the 2D table."""
+    n = len(weights)
+    dp = [[0 for _ in range(capacity + 1)] for _ in range(n + 1)]
+    
+    for i in range(1, n + 1):
+        for w in range(capacity + 1):
+            dp[i][w] = dp[i-1][w]
+            if weights[i-1] <= w:
+                include_value = values[i-1] + dp[i-1][w - weights[i-1]]
+                dp[i][w] = max(dp[i][w], include_value)
+    
+    selected = []
+    w = capacity
+    for i in range(n, 0, -1):
+        if dp[i][w] != dp[i-1][w]:
+            selected.append(i-1)
+            w -= weights[i-1]
+    
+    selected.reverse()
+    return dp[n][capacity], selected
@@ -0,0 +1,7 @@
+"""
+Server-side grading tools for the course challenges.
+
+The browser grades one submission at a time inside Pyodide. The modules in
+this package run the same ``*_tests.py`` harnesses under CPython so whole
+directories of submissions can be regraded from the command line.
+"""
@@ -0,0 +1,172 @@
+"""
+Batch grader
+
+Grades a directory of submissions against every challenge in the course
+catalog, spreading the work over a pool of warm grading workers (see
+grader.service) and writing one JSON line per submission. Every job runs
+under the pool's CPU, memory and wall-clock limits, so a submission that
+hangs or exits only loses its own record.
+
+Submissions are laid out by course and challenge, optionally by section:
+
+    submissions/
+        dynamic_programming/
+            knapsack/
+                alice.py
+                memoization/
+                    bob.py
+
+Usage:
+    python -m grader.batch submissions/ -o results.jsonl --workers 8
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from grader.catalog import DEFAULT_COURSES_DIR, load_challenges
+from grader.harness import new_record
+from grader.service import GradingService
+
+
+def grade_submission(job, service):
+    """
+    Grade a single submission file on the service's worker pool.
+
+    Args:
+        job: dict with course_id, challenge_id, section_id, tests and
+            submission paths
+        service: GradingService to run it on
+
+    Returns:
+        JSON-serialisable result record
+    """
+    try:
+        with open(job['submission'], encoding='utf-8') as f:
+            source = f.read()
+    except OSError as e:
+        record = new_record(job)
+        record['error'] = f'{type(e).__name__}: {e}'
+        return record
+    return service.run(job, source)
+
+
+def collect_jobs(submissions_dir, challenges, corpus=None, stop_on_failure=False, time_budget=None):
+    """
+    Pair every submission file with its challenge's tests harness.
+
+    Args:
+        submissions_dir: root of the <course>/<challenge>[/<section>] tree
+        challenges: output of catalog.load_challenges()
+        corpus: optional binary corpus (see grader.corpus) run for every
+            bottom-up solution (see harness.corpus_skip_reason)
+        stop_on_failure: stop grading a submission at its first failing case
+        time_budget: seconds of built-in tests per submission
+
+    Returns:
+        List of job dicts for grade_submission()
+    """
+    jobs = []
+    for challenge in challenges:
+        if not challenge['tests']:
+            continue
+        root = os.path.join(submissions_dir, challenge['course_id'], challenge['challenge_id'])
+        if not os.path.isdir(root):
+            continue
+
+        section_ids = {section['id'] for section in challenge['sections']}
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames.sort()
+            rel = os.path.relpath(dirpath, root)
+            section_id = rel.split(os.sep)[0] if rel != '.' else None
+            if section_id not in section_ids:
+                section_id = None
+
+            for filename in sorted(filenames):
+                if not filename.endswith('.py'):
+                    continue
+                jobs.append({
+                    'course_id': challenge['course_id'],
+                    'challenge_id': challenge['challenge_id'],
+                    'section_id': section_id,
+                    'tests': challenge['tests'],
+                    'submission': os.path.join(dirpath, filename),
+                    'corpus': corpus,
+                    'stop_on_failure': stop_on_failure,
+                    'time_budget': time_budget
+                })
+    return jobs
+
+
+def run_batch(jobs, out, service):
+    """
+    Grade jobs on a GradingService, streaming JSON lines to out.
+
+    Args:
+        jobs: list of job dicts from collect_jobs()
+        out: writable text file
+        service: GradingService whose workers run the jobs
+
+    Returns:
+        Summary dict with submission counts and total wall time
+    """
+    summary = {'submissions': 0, 'all_passed': 0, 'errors': 0}
+    start = time.perf_counter()
+
+    # One client thread per worker keeps every worker busy
+    with ThreadPoolExecutor(service.pool_size) as clients:
+        futures = [clients.submit(grade_submission, job, service) for job in jobs]
+        for future in as_completed(futures):
+            record = future.result()
+            out.write(json.dumps(record) + '\n')
+            summary['submissions'] += 1
+            if record['error']:
+                summary['errors'] += 1
+            # A run with no cases at all is not a pass
+            elif record['total'] and record['passed'] == record['total']:
+                summary['all_passed'] += 1
+
+    summary['elapsed_s'] = round(time.perf_counter() - start, 3)
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Grade a directory of submissions against the course tests.')
+    parser.add_argument('submissions', help='directory laid out as <course>/<challenge>[/<section>]/*.py')
+    parser.add_argument('--courses', default=DEFAULT_COURSES_DIR, help='directory containing index.json')
+    parser.add_argument('-o', '--output', default='-', help='JSON-lines output file (default: stdout)')
+    parser.add_argument('-j', '--workers', type=int, default=None, help='worker processes (default: CPU count)')
+    parser.add_argument('--corpus', help='binary test corpus to run after the built-in tests (bottom-up solutions only)')
+    parser.add_argument('--fail-fast', action='store_true', help='stop each submission at its first failing case')
+    parser.add_argument('--time-budget', type=float, default=None, help='seconds of built-in tests per submission')
+    parser.add_argument('--cpu', type=int, default=30, help='CPU seconds per submission (0 disables)')
+    parser.add_argument('--memory', type=int, default=512, help='extra MiB of address space per submission (0 disables)')
+    parser.add_argument('--wall', type=float, default=60, help='wall-clock seconds per submission')
+    args = parser.parse_args(argv)
+
+    jobs = collect_jobs(args.submissions, load_challenges(args.courses), args.corpus,
+                        args.fail_fast, args.time_budget)
+    if not jobs:
+        print(f'No submissions found under {args.submissions}', file=sys.stderr)
+        return 1
+
+    service = GradingService(args.workers or os.cpu_count(), args.cpu, args.memory, args.wall, args.courses)
+    try:
+        if args.output == '-':
+            summary = run_batch(jobs, sys.stdout, service)
+        else:
+            with open(args.output, 'w', encoding='utf-8') as out:
+                summary = run_batch(jobs, out, service)
+    finally:
+        service.close()
+
+    print(f"Graded {summary['submissions']} submissions in {summary['elapsed_s']}s: "
+          f"{summary['all_passed']} fully passing, {summary['errors']} errored", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
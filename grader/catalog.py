@@ -0,0 +1,70 @@
+"""
+Course catalog loader
+
+Reads ``public/courses/index.json`` and every ``course.json`` it points to,
+and resolves the starter / tests / section files of each challenge to paths
+on disk.
+"""
+
+import json
+import os
+
+
+DEFAULT_COURSES_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    'public', 'courses'
+)
+
+# Keep in sync with the lookup order in src/components/CodeEditor.tsx
+FUNC_NAMES = ['knapsack_recursive', 'knapsack_memo', 'knapsack_dp', 'knapsack_optimized', 'knapsack']
+
+
+def _resolve(courses_dir, course_folder, path):
+    """Resolve a course.json path the same way the front end fetches it."""
+    if not path:
+        return None
+    if path.startswith('/'):
+        # Absolute paths are relative to the web root (public/)
+        return os.path.join(os.path.dirname(courses_dir), path.lstrip('/'))
+    return os.path.join(courses_dir, course_folder, path)
+
+
+def load_challenges(courses_dir=DEFAULT_COURSES_DIR):
+    """
+    Collect every challenge listed in the course catalog.
+    
+    Args:
+        courses_dir: directory containing index.json
+    
+    Returns:
+        List of dicts with course_id, challenge_id, starter, tests and
+        sections (a list of {id, file, code} dicts), all as absolute paths
+    """
+    with open(os.path.join(courses_dir, 'index.json'), encoding='utf-8') as f:
+        index = json.load(f)
+    
+    challenges = []
+    for entry in index:
+        folder = entry.get('folder', entry['id'])
+        course_path = os.path.join(courses_dir, folder, 'course.json')
+        if not os.path.exists(course_path):
+            continue
+        with open(course_path, encoding='utf-8') as f:
+            course = json.load(f)
+        
+        for challenge in course.get('challenges', []):
+            sections = [{
+                'id': section['id'],
+                'file': _resolve(courses_dir, folder, section.get('file')),
+                'code': _resolve(courses_dir, folder, section.get('code'))
+            } for section in challenge.get('sections', [])]
+            
+            challenges.append({
+                'course_id': course.get('id', entry['id']),
+                'challenge_id': challenge['id'],
+                'starter': _resolve(courses_dir, folder, challenge.get('starter')),
+                'tests': _resolve(courses_dir, folder, challenge.get('tests')),
+                'sections': sections
+            })
+    
+    return challenges
@@ -0,0 +1,139 @@
+"""
+Hidden test corpus builder
+
+Generates large seeded knapsack instances, solves them with an exact
+engine and writes them in the binary corpus format defined by the
+challenge harness (knapsack_tests.write_corpus). The graders read the
+result back through knapsack_tests.iter_corpus, which maps the file
+instead of loading it.
+
+Cases are large in n but their capacity is capped (--max-capacity), so the
+O(n × capacity) course solutions being graded can still finish them. The
+whole corpus runs inside one submission's CPU limit: pure-Python table
+solutions manage roughly 2-4 million n × capacity cells per second, so
+the defaults (about 6M cells) stay well inside grader.batch's --cpu 30.
+build reports the total so larger corpora can be matched to --cpu.
+
+Expected answers come from engines.core, which is fast at any n; check
+re-solves the cases with the independent knapsack_optimized reference.
+
+Usage:
+    python -m grader.corpus build hidden.corpus --cases 40 --max-n 2000
+    python -m grader.corpus check hidden.corpus
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+from engines.core import generate_instance, knapsack_core
+from engines.reference import knapsack_optimized
+from grader.harness import load_harness
+from grader.catalog import DEFAULT_COURSES_DIR
+
+KNAPSACK_TESTS = os.path.join(DEFAULT_COURSES_DIR, 'dynamic_programming', 'knapsack_tests.py')
+
+
+def generate_cases(count, min_n, max_n, max_weight=100, max_capacity=500, seed=0, solver=knapsack_core):
+    """
+    Yield seeded instances with their expected answers.
+
+    Args:
+        count: number of cases
+        min_n, max_n: item count range
+        max_weight: weights and values are drawn up to this
+        max_capacity: cap on the capacity (otherwise half the total weight)
+        seed: master seed for the whole corpus
+        solver: exact solver used for the expected answers
+    """
+    rng = random.Random(seed)
+    kinds = ('uncorrelated', 'weakly')
+    for i in range(count):
+        n = rng.randint(min_n, max_n)
+        weights, values, capacity = generate_instance(n, kinds[i % len(kinds)], max_weight, rng.getrandbits(32))
+        capacity = min(capacity, max_capacity)
+        yield {
+            'weights': weights,
+            'values': values,
+            'capacity': capacity,
+            'expected': solver(weights, values, capacity)
+        }
+
+
+def check_corpus(path, solver=knapsack_optimized, max_cells=5_000_000):
+    """
+    Re-solve corpus cases with an independent solver.
+
+    Args:
+        path: corpus file
+        solver: solver to compare against (not the one that built the corpus)
+        max_cells: skip cases with more than this many n × capacity cells
+
+    Returns:
+        (case numbers that disagree, number checked, number skipped)
+    """
+    harness = load_harness(KNAPSACK_TESTS)
+    mismatches = []
+    checked = skipped = 0
+    for i, case in enumerate(harness['iter_corpus'](path), 1):
+        if len(case['weights']) * (case['capacity'] + 1) > max_cells:
+            skipped += 1
+            continue
+        checked += 1
+        if solver(case['weights'].tolist(), case['values'].tolist(), case['capacity']) != case['expected']:
+            mismatches.append(i)
+    return mismatches, checked, skipped
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Build or verify a binary knapsack test corpus.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    build = commands.add_parser('build', help='generate and solve a new corpus')
+    build.add_argument('path')
+    build.add_argument('--cases', type=int, default=20)
+    build.add_argument('--min-n', type=int, default=200)
+    build.add_argument('--max-n', type=int, default=1000)
+    build.add_argument('--max-weight', type=int, default=100)
+    build.add_argument('--max-capacity', type=int, default=500,
+                       help='keeps n × capacity within reach of the graded O(n × capacity) solutions')
+    build.add_argument('--seed', type=int, default=0)
+
+    check = commands.add_parser('check', help='re-solve every case and compare')
+    check.add_argument('path')
+    check.add_argument('--max-cells', type=int, default=5_000_000,
+                       help='skip cases too large for knapsack_optimized')
+
+    args = parser.parse_args(argv)
+    harness = load_harness(KNAPSACK_TESTS)
+    start = time.perf_counter()
+
+    if args.command == 'build':
+        cells = 0
+
+        def counted(cases):
+            nonlocal cells
+            for case in cases:
+                cells += len(case['weights']) * (case['capacity'] + 1)
+                yield case
+
+        cases = generate_cases(args.cases, args.min_n, args.max_n, args.max_weight, args.max_capacity, args.seed)
+        written = harness['write_corpus'](args.path, counted(cases))
+        size_mb = os.path.getsize(args.path) / 2**20
+        print(f'Wrote {written} cases ({size_mb:.1f} MiB, {cells / 1e6:.1f}M n × capacity cells) '
+              f'to {args.path} in {time.perf_counter() - start:.1f}s', file=sys.stderr)
+        return 0
+
+    mismatches, checked, skipped = check_corpus(args.path, max_cells=args.max_cells)
+    if mismatches:
+        print(f'Expected answers disagree for cases: {mismatches}', file=sys.stderr)
+        return 1
+    print(f'{checked} cases in {args.path} verified against knapsack_optimized '
+          f'in {time.perf_counter() - start:.1f}s ({skipped} too large, skipped)', file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
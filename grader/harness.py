@@ -0,0 +1,139 @@
+"""
+Submission harness
+
+Runs one submission's source against its challenge's ``*_tests.py``
+harness. Shared by the batch grader and the grading service workers.
+"""
+
+import contextlib
+import io
+import time
+
+from grader.catalog import FUNC_NAMES
+
+# Top-down solvers recurse once per item, so hidden corpus cases (n in the
+# hundreds to thousands) overflow the recursion limit, and plain recursion
+# is exponential anyway; the corpus only runs for bottom-up solutions
+TOP_DOWN_FUNCS = ('knapsack_recursive', 'knapsack_memo')
+TOP_DOWN_SECTIONS = ('intro', 'recursive', 'memoization')
+
+# Test harness namespaces, cached per worker process
+_harness_cache = {}
+
+
+def load_harness(tests_path):
+    """
+    Execute a tests module once per process and return its namespace.
+
+    Args:
+        tests_path: path to a *_tests.py harness
+
+    Returns:
+        Dict of the module's globals (run_tests, print_results, ...)
+    """
+    namespace = _harness_cache.get(tests_path)
+    if namespace is None:
+        with open(tests_path, encoding='utf-8') as f:
+            source = f.read()
+        namespace = {'__name__': 'grader_harness', '__file__': tests_path}
+        exec(compile(source, tests_path, 'exec'), namespace)
+        _harness_cache[tests_path] = namespace
+    return namespace
+
+
+def find_solution(namespace):
+    """Return (name, function) for the first known solver the submission defines."""
+    for name in FUNC_NAMES:
+        func = namespace.get(name)
+        if callable(func):
+            return name, func
+    return None, None
+
+
+def new_record(job):
+    """Empty result record for a job, filled in by grade_source()."""
+    return {
+        'course_id': job['course_id'],
+        'challenge_id': job['challenge_id'],
+        'section_id': job.get('section_id'),
+        'submission': job['submission'],
+        'function': None,
+        'passed': 0,
+        'total': 0,
+        'results': [],
+        'error': None
+    }
+
+
+def corpus_skip_reason(job, function):
+    """Why a job's corpus won't run for this solver, or None if it will."""
+    if function in TOP_DOWN_FUNCS:
+        return f'{function} is top-down; the corpus only runs for bottom-up solutions'
+    if job.get('section_id') in TOP_DOWN_SECTIONS:
+        return f"section {job['section_id']} is top-down; the corpus only runs for bottom-up solutions"
+    return None
+
+
+def grade_source(job, source):
+    """
+    Run a submission's source against its challenge's harness.
+
+    Args:
+        job: dict with course_id, challenge_id, section_id, tests,
+            submission (used as the filename in tracebacks) and optionally
+            corpus, a binary test corpus to run after the built-in tests
+            (bottom-up solutions only), and stop_on_failure / time_budget
+            (see knapsack_tests.iter_tests)
+        source: submission source code
+
+    Returns:
+        JSON-serialisable result record. Results gathered before an error
+        (e.g. the CPU limit hitting during the corpus) are kept.
+    """
+    record = new_record(job)
+    results = record['results']
+    start = time.perf_counter()
+
+    try:
+        harness = load_harness(job['tests'])
+        namespace = {'__name__': 'submission', '__file__': job['submission']}
+
+        # Submissions print while they run; keep that out of the results file
+        with contextlib.redirect_stdout(io.StringIO()):
+            exec(compile(source, job['submission'], 'exec'), namespace)
+            load_done = time.perf_counter()
+
+            name, func = find_solution(namespace)
+            if func is None:
+                raise LookupError('No knapsack function found. Define one of: ' + ', '.join(FUNC_NAMES))
+            record['function'] = name
+            if job.get('stop_on_failure') or job.get('time_budget') is not None:
+                results.extend(harness['iter_tests'](func, job.get('stop_on_failure', False), job.get('time_budget')))
+            else:
+                results.extend(harness['run_tests'](func))
+
+            # A fail-fast stop or a spent time budget also skips the corpus
+            failed = any(not r['passed'] for r in results)
+            cut_off = any(r.get('skipped') for r in results)
+            if job.get('corpus') and not cut_off and not (failed and job.get('stop_on_failure')):
+                reason = corpus_skip_reason(job, name)
+                if reason:
+                    record['corpus_skipped'] = reason
+                else:
+                    offset = len(results)
+                    for result in harness['run_corpus_tests'](func, job['corpus']):
+                        result['test_num'] += offset
+                        results.append(result)
+
+        record['load_ms'] = round((load_done - start) * 1000, 3)
+    except BaseException as e:
+        # Submissions can raise SystemExit (sys.exit) or other non-Exception
+        # errors; none of them may take the grading worker down with them
+        if isinstance(e, KeyboardInterrupt):
+            raise
+        record['error'] = f'{type(e).__name__}: {e}'
+
+    record['passed'] = sum(1 for r in results if r['passed'])
+    record['total'] = len(results)
+    record['elapsed_ms'] = round((time.perf_counter() - start) * 1000, 3)
+    return record
@@ -0,0 +1,166 @@
+"""
+Load generator for the grading service
+
+Starts a GradingService at each pool size, fires a fixed number of grading
+requests at it from concurrent clients, and reports latency percentiles and
+throughput. With --cold it also times the baseline this service replaces:
+one fresh interpreter per submission.
+
+The built-in tests alone take well under a millisecond, so by default the
+numbers mostly measure HTTP and process overhead. --heavy (or --corpus)
+makes every request also run a test corpus, tens of milliseconds of real
+grading, which is the load where pool size should scale with the cores.
+
+Usage:
+    python -m grader.loadgen --pool-sizes 1 2 4 8 --requests 400 --concurrency 16
+    python -m grader.loadgen --pool-sizes 1 2 4 8 --requests 100 --heavy
+"""
+
+import argparse
+import inspect
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import engines.reference
+from grader.corpus import KNAPSACK_TESTS, generate_cases
+from grader.harness import load_harness
+from grader.service import GradingService, make_server
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of numbers."""
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    rank = max(1, round(pct / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def _post(url, payload):
+    request = urllib.request.Request(
+        url,
+        data=json.dumps(payload).encode('utf-8'),
+        headers={'Content-Type': 'application/json'}
+    )
+    start = time.perf_counter()
+    with urllib.request.urlopen(request) as response:
+        record = json.loads(response.read())
+    return (time.perf_counter() - start) * 1000, record
+
+
+def build_heavy_corpus(path, seed=0):
+    """Write a small corpus that adds tens of milliseconds of grading per request."""
+    cases = generate_cases(4, 100, 300, max_capacity=200, seed=seed)
+    return load_harness(KNAPSACK_TESTS)['write_corpus'](path, cases)
+
+
+def run_load(pool_size, payload, requests, concurrency, **limits):
+    """
+    Benchmark one pool size.
+
+    Args:
+        pool_size: number of workers
+        payload: JSON body for every /grade request
+        requests: total requests to send
+        concurrency: client threads sending them
+        limits: extra GradingService arguments (limits, corpus)
+
+    Returns:
+        Dict with pool size, p50/p99 latency (ms), throughput (req/s) and
+        the number of requests that came back with an error
+    """
+    service = GradingService(pool_size, **limits)
+    server = make_server(service, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f'http://127.0.0.1:{server.server_port}/grade'
+
+    try:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(concurrency) as clients:
+            outcomes = list(clients.map(lambda _: _post(url, payload), range(requests)))
+        elapsed = time.perf_counter() - start
+    finally:
+        server.shutdown()
+        server.server_close()
+        service.close()
+
+    latencies = [latency for latency, _ in outcomes]
+    return {
+        'pool_size': pool_size,
+        'p50_ms': round(percentile(latencies, 50), 2),
+        'p99_ms': round(percentile(latencies, 99), 2),
+        'throughput': round(requests / elapsed, 1),
+        'errors': sum(1 for _, record in outcomes if record['error'])
+    }
+
+
+def run_cold(source, requests, corpus=None):
+    """Grade by starting a fresh interpreter for every submission."""
+    script = (
+        'import sys\n'
+        'from grader.harness import grade_source\n'
+        'from grader.catalog import load_challenges\n'
+        'c = next(c for c in load_challenges() if c["challenge_id"] == "knapsack")\n'
+        'job = dict(c, section_id=None, submission="<cold>", corpus=sys.argv[1] or None)\n'
+        'grade_source(job, sys.stdin.read())\n'
+    )
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(requests):
+        t0 = time.perf_counter()
+        subprocess.run([sys.executable, '-c', script, corpus or ''], input=source, text=True, check=True)
+        latencies.append((time.perf_counter() - t0) * 1000)
+    elapsed = time.perf_counter() - start
+    return {
+        'pool_size': 'cold',
+        'p50_ms': round(percentile(latencies, 50), 2),
+        'p99_ms': round(percentile(latencies, 99), 2),
+        'throughput': round(requests / elapsed, 1),
+        'errors': 0
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the grading service at several pool sizes.')
+    parser.add_argument('--pool-sizes', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--requests', type=int, default=400)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--cold', action='store_true', help='also time one interpreter per submission')
+    parser.add_argument('--corpus', help='run this test corpus on every request')
+    parser.add_argument('--heavy', action='store_true', help='run a small generated corpus on every request')
+    args = parser.parse_args(argv)
+
+    source = inspect.getsource(engines.reference.knapsack_optimized)
+    payload = {'course_id': 'dynamic_programming', 'challenge_id': 'knapsack', 'source': source}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus = args.corpus
+        if args.heavy and not corpus:
+            corpus = os.path.join(tmp, 'heavy.corpus')
+            build_heavy_corpus(corpus)
+
+        rows = []
+        if args.cold:
+            rows.append(run_cold(source, min(args.requests, 50), corpus))
+        for pool_size in args.pool_sizes:
+            rows.append(run_load(pool_size, payload, args.requests, args.concurrency, corpus=corpus))
+
+    workload = f'built-in tests + corpus {os.path.basename(corpus)}' if corpus else 'built-in tests only'
+    print(f'Workload: {workload}, {os.cpu_count()} CPUs')
+    print(f"{'pool':>6} {'p50 ms':>10} {'p99 ms':>10} {'req/s':>10} {'errors':>8}")
+    for row in rows:
+        print(f"{row['pool_size']:>6} {row['p50_ms']:>10} {row['p99_ms']:>10} "
+              f"{row['throughput']:>10} {row['errors']:>8}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
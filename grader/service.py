@@ -0,0 +1,424 @@
+"""
+Grading service
+
+A local HTTP service that keeps a pool of pre-warmed worker processes. Every
+worker has the challenge harnesses and the reference solutions imported
+before the first job arrives, so a submission only pays for its own code.
+
+A worker never runs a submission itself: it forks a throwaway child per
+job, which starts with everything already imported and is discarded with
+whatever the submission changed (harness namespaces, modules, builtins).
+Each job child runs under resource limits:
+
+    - CPU seconds via RLIMIT_CPU (SIGXCPU aborts the job with its results so far)
+    - address space via RLIMIT_AS (allocations fail with MemoryError)
+    - a wall-clock deadline enforced by the worker, which kills the child
+      (covers sleeps and blocking I/O)
+
+Workers are started by a forkserver with the grading modules preloaded.
+The service itself is threaded (HTTP handlers, batch clients), and forking
+it directly could hand a worker a copy of a lock some other thread held;
+the forkserver is single-threaded, as is every worker that forks job
+children.
+
+Linux only: relies on the forkserver start method, ``resource`` and /proc.
+
+API:
+    POST /grade   {"course_id", "challenge_id", "section_id"?, "source"}
+    GET  /health
+
+With --corpus every graded submission also runs a binary test corpus
+(see grader.corpus) after the built-in tests.
+
+Usage:
+    python -m grader.service --port 8765 --workers 4
+"""
+
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import queue
+import resource
+import signal
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from grader.harness import grade_source, load_harness, new_record
+from grader.catalog import DEFAULT_COURSES_DIR, load_challenges
+
+# Extra time a worker gets past the wall limit to kill its job child and answer
+WORKER_GRACE_SECONDS = 5
+
+
+class CPULimitExceeded(BaseException):
+    """
+    Raised from the SIGXCPU handler.
+
+    Derives from BaseException so the per-test ``except Exception`` in the
+    harnesses can't swallow it and keep burning CPU; grade_source records
+    it as the job's error.
+    """
+
+
+def _vm_bytes():
+    """Current virtual memory size of this process."""
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[0]) * resource.getpagesize()
+
+
+def _cpu_seconds():
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+# Imported once in the forkserver, so every worker starts with them loaded
+PRELOAD_MODULES = ['grader.harness', 'grader.service', 'engines.reference']
+
+
+def warm_up(challenges):
+    """Load everything a job needs so job children start hot."""
+    import engines.reference  # noqa: F401
+    for challenge in challenges:
+        if challenge['tests']:
+            load_harness(challenge['tests'])
+
+
+def _send_record(conn, job, record):
+    try:
+        conn.send(record)
+    except Exception as e:
+        # Never leave the reader waiting on a record that can't be pickled
+        fallback = new_record(job)
+        fallback['error'] = f'ResultError: could not send the result back ({type(e).__name__}: {e})'
+        conn.send(fallback)
+
+
+def _job_main(conn, job, source, cpu_seconds, memory_mb):
+    """
+    Body of a throwaway job child: grade under limits and send the record.
+    """
+    _, cpu_hard = resource.getrlimit(resource.RLIMIT_CPU)
+    _, as_hard = resource.getrlimit(resource.RLIMIT_AS)
+
+    # A fresh child starts at zero CPU time but inherits the worker's mappings
+    if cpu_seconds:
+        resource.setrlimit(resource.RLIMIT_CPU, (math.ceil(_cpu_seconds() + cpu_seconds), cpu_hard))
+    if memory_mb:
+        resource.setrlimit(resource.RLIMIT_AS, (_vm_bytes() + memory_mb * 1024 * 1024, as_hard))
+
+    try:
+        record = grade_source(job, source)
+    except CPULimitExceeded:
+        record = new_record(job)
+        record['error'] = f'CPULimitExceeded: more than {cpu_seconds}s of CPU time'
+    _send_record(conn, job, record)
+
+
+def _run_job(conn, job, source, cpu_seconds, memory_mb, wall_seconds):
+    """
+    Grade one job in a child forked from this worker and collect its record.
+
+    The worker is single-threaded, so forking here is safe, and the child
+    throws away any state the submission changed.
+    """
+    reader, writer = multiprocessing.Pipe(duplex=False)
+    pid = os.fork()
+    if pid == 0:
+        try:
+            reader.close()
+            conn.close()
+            _job_main(writer, job, source, cpu_seconds, memory_mb)
+        finally:
+            os._exit(0)
+
+    writer.close()
+    try:
+        if reader.poll(wall_seconds):
+            return reader.recv()
+        os.kill(pid, signal.SIGKILL)
+        record = new_record(job)
+        record['error'] = f'TimeoutError: more than {wall_seconds}s of wall-clock time'
+        return record
+    except EOFError:
+        record = new_record(job)
+        record['error'] = 'JobCrashed: the job exited without sending a result'
+        return record
+    finally:
+        reader.close()
+        os.waitpid(pid, 0)
+
+
+def _worker_main(conn, cpu_seconds, memory_mb, wall_seconds, challenges):
+    """
+    Worker loop: receive (job, source), grade it in a job child, send the record.
+    """
+    warm_up(challenges)
+    def on_sigxcpu(signum, frame):
+        raise CPULimitExceeded(f'more than {cpu_seconds}s of CPU time')
+
+    # Both are inherited by every job child
+    signal.signal(signal.SIGXCPU, on_sigxcpu)
+    # Ctrl-C is handled by the service, which terminates the workers
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    while True:
+        try:
+            job, source = conn.recv()
+        except EOFError:
+            return
+        _send_record(conn, job, _run_job(conn, job, source, cpu_seconds, memory_mb, wall_seconds))
+
+
+class Worker:
+    """Handle on one pre-warmed worker process and its pipe."""
+
+    def __init__(self, ctx, cpu_seconds, memory_mb, wall_seconds, challenges):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(
+            target=_worker_main,
+            args=(child_conn, cpu_seconds, memory_mb, wall_seconds, challenges),
+            daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        self.jobs = 0
+
+    def run(self, job, source, timeout):
+        """
+        Send a job and wait for its record.
+
+        Raises:
+            TimeoutError: no answer within timeout seconds
+            EOFError: the worker died mid-job
+        """
+        self.jobs += 1
+        self.conn.send((job, source))
+        if not self.conn.poll(timeout):
+            raise TimeoutError()
+        return self.conn.recv()
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+class GradingService:
+    """
+    Pool of warm workers with per-job limits.
+
+    Args:
+        pool_size: number of worker processes
+        cpu_seconds: CPU limit per job (0 disables)
+        memory_mb: extra address space allowed per job (0 disables)
+        wall_seconds: wall-clock limit per job, after which the job child is killed
+        courses_dir: directory containing index.json
+        recycle_after: replace a worker after this many jobs (submissions
+            never run in the worker itself; this only bounds its lifetime)
+        corpus: optional binary corpus run for every job grade() builds
+    """
+
+    def __init__(self, pool_size=4, cpu_seconds=5, memory_mb=256, wall_seconds=10,
+                 courses_dir=DEFAULT_COURSES_DIR, recycle_after=500, corpus=None):
+        self.pool_size = pool_size
+        self.corpus = corpus
+        self.cpu_seconds = cpu_seconds
+        self.memory_mb = memory_mb
+        self.wall_seconds = wall_seconds
+        self.recycle_after = recycle_after
+        self.challenges = {
+            (c['course_id'], c['challenge_id']): c
+            for c in load_challenges(courses_dir)
+        }
+
+        self._ctx = multiprocessing.get_context('forkserver')
+        self._ctx.set_forkserver_preload(PRELOAD_MODULES)
+        self._lock = threading.Lock()
+        self._idle = queue.Queue()
+        self._workers = []
+
+        # Replacements are started on this thread so a request never waits
+        # for a worker to start up and load the harnesses
+        self._spawn_requests = queue.Queue()
+        self._spawner = threading.Thread(target=self._spawn_loop, daemon=True)
+        self._spawner.start()
+        for _ in range(pool_size):
+            self._spawn_requests.put(True)
+
+    def _spawn_loop(self):
+        while self._spawn_requests.get() is not None:
+            worker = Worker(self._ctx, self.cpu_seconds, self.memory_mb, self.wall_seconds,
+                            list(self.challenges.values()))
+            with self._lock:
+                self._workers.append(worker)
+            self._idle.put(worker)
+
+    def _replace(self, worker):
+        """Kill a worker and have the spawner thread start a fresh one."""
+        worker.kill()
+        with self._lock:
+            self._workers.remove(worker)
+        self._spawn_requests.put(True)
+
+    def run(self, job, source):
+        """
+        Grade a prepared job (see grader.harness.grade_source) on the next idle worker.
+
+        Returns:
+            Result record, with error set if a limit was hit or the worker died
+        """
+        worker = self._idle.get()
+        start = time.perf_counter()
+        try:
+            # The worker enforces the wall limit on its job child; this
+            # backstop only fires if the worker itself stops answering
+            record = worker.run(job, source, self.wall_seconds + WORKER_GRACE_SECONDS)
+        except TimeoutError:
+            self._replace(worker)
+            record = new_record(job)
+            record['error'] = f'TimeoutError: more than {self.wall_seconds}s of wall-clock time'
+        except (EOFError, OSError):
+            self._replace(worker)
+            record = new_record(job)
+            record['error'] = 'WorkerCrashed: worker process exited during the job'
+        else:
+            if worker.jobs >= self.recycle_after:
+                self._replace(worker)
+            else:
+                self._idle.put(worker)
+
+        record['latency_ms'] = round((time.perf_counter() - start) * 1000, 3)
+        return record
+
+    def grade(self, course_id, challenge_id, source, section_id=None, submission='<submission>'):
+        """
+        Grade one submission on the next idle worker.
+
+        Raises:
+            KeyError: unknown course/challenge pair
+        """
+        challenge = self.challenges[(course_id, challenge_id)]
+        job = {
+            'course_id': course_id,
+            'challenge_id': challenge_id,
+            'section_id': section_id,
+            'tests': challenge['tests'],
+            'submission': submission,
+            'corpus': self.corpus
+        }
+        return self.run(job, source)
+
+    def status(self):
+        with self._lock:
+            return {'workers': len(self._workers), 'idle': self._idle.qsize()}
+
+    def close(self):
+        self._spawn_requests.put(None)
+        self._spawner.join()
+        with self._lock:
+            for worker in self._workers:
+                worker.kill()
+            self._workers = []
+
+
+class GradingHandler(BaseHTTPRequestHandler):
+    """JSON endpoints in front of a GradingService (set on the server)."""
+
+    def _send_json(self, status, payload):
+        # default=repr: a record with a stray non-JSON value still gets a reply
+        body = json.dumps(payload, default=repr).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == '/health':
+            self._send_json(200, self.server.service.status())
+        else:
+            self._send_json(404, {'error': 'not found'})
+
+    def do_POST(self):
+        if self.path != '/grade':
+            self._send_json(404, {'error': 'not found'})
+            return
+
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            request = json.loads(self.rfile.read(length))
+            if not isinstance(request, dict):
+                self._send_json(400, {'error': 'request body must be a JSON object'})
+                return
+            record = self.server.service.grade(
+                request['course_id'],
+                request['challenge_id'],
+                request['source'],
+                section_id=request.get('section_id'),
+                submission=request.get('submission', '<submission>')
+            )
+        except KeyError as e:
+            self._send_json(400, {'error': f'unknown or missing field: {e}'})
+            return
+        except ValueError as e:
+            self._send_json(400, {'error': f'invalid JSON: {e}'})
+            return
+        except TypeError as e:
+            # e.g. a field of the wrong type, such as a list for course_id
+            self._send_json(400, {'error': f'invalid field: {e}'})
+            return
+
+        self._send_json(200, record)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class GradingServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default backlog of 5 drops connections under bursty load and the
+    # client only retries after a 1s SYN timeout, which swamps the p99
+    request_queue_size = 128
+
+
+def make_server(service, host='127.0.0.1', port=8765, verbose=False):
+    """Bind a threading HTTP server to the given service (port 0 picks a free one)."""
+    server = GradingServer((host, port), GradingHandler)
+    server.service = service
+    server.verbose = verbose
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Serve submissions to a pool of warm grading workers.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('-j', '--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--cpu', type=int, default=5, help='CPU seconds per job (0 disables)')
+    parser.add_argument('--memory', type=int, default=256, help='extra MiB of address space per job (0 disables)')
+    parser.add_argument('--wall', type=float, default=10, help='wall-clock seconds per job')
+    parser.add_argument('--courses', default=DEFAULT_COURSES_DIR, help='directory containing index.json')
+    parser.add_argument('--corpus', help='binary test corpus to run after the built-in tests')
+    parser.add_argument('-v', '--verbose', action='store_true', help='log every request')
+    args = parser.parse_args(argv)
+
+    service = GradingService(args.workers, args.cpu, args.memory, args.wall, args.courses, corpus=args.corpus)
+    server = make_server(service, args.host, args.port, args.verbose)
+    print(f'Grading on http://{args.host}:{server.server_port} with {args.workers} workers', file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
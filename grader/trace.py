@@ -0,0 +1,447 @@
+"""
+DP table access tracer
+
+Instruments a submission so every read and write of its DP table or memo
+is counted per cell, and every call of the solver is counted per state.
+This turns "the recursive version recomputes states" and "two rows move
+more memory than one" into numbers:
+
+    - reads / writes per cell of each table, row or memo
+    - calls per (n, capacity) state and how many of them were repeats
+    - the order of the first accesses
+    - heatmap-ready matrices (state × capacity) of any of those counts
+
+The submission's source is rewritten so that a freshly built list or dict
+bound to a name (a display, comprehension, ``[0] * n``, slice copy,
+``list(...)`` / ``dict(...)``) is wrapped in a tracing proxy, whether it is
+a local, a module-level global, one element of a tuple assignment or a
+default argument; lists of lists, and lists that rows are appended to,
+become a table of traced rows. Names bound to existing objects
+(``row = weights``) are left alone so aliasing behaves exactly as untraced.
+Rows shared inside a table (``[[0] * W] * n``) stay shared and are reported
+under aliased_rows instead of being silently separated. Swaps like
+``prev, curr = curr, prev`` keep the proxies, so counts follow the buffers
+rather than the names.
+
+Usage:
+    python -m grader.trace                          # compare the reference solutions
+    python -m grader.trace solution.py -f knapsack_memo --json trace.json
+"""
+
+import argparse
+import ast
+import inspect
+import json
+import sys
+from collections import Counter
+
+import engines.reference
+
+
+class AccessTrace:
+    """
+    Counters filled in by the traced containers and the call wrapper.
+
+    Attributes:
+        cells: {buffer: {key: [reads, writes]}}
+        calls: Counter of solver calls per state
+        order: first max_events accesses as (op, buffer, key)
+    """
+
+    def __init__(self, max_events=10000):
+        self.cells = {}
+        self.calls = Counter()
+        self.order = []
+        self.max_events = max_events
+        self.aliases = {}
+        self._names = Counter()
+
+    def new_buffer(self, name):
+        """Register a buffer, numbering repeats (memo, memo#2, ...)."""
+        self._names[name] += 1
+        if self._names[name] > 1:
+            name = f'{name}#{self._names[name]}'
+        self.cells[name] = {}
+        return name
+
+    def record(self, op, buffer, key):
+        counts = self.cells[buffer].setdefault(key, [0, 0])
+        counts[0 if op == 'read' else 1] += 1
+        if len(self.order) < self.max_events:
+            self.order.append((op, buffer, key))
+
+    def summary(self):
+        """Compact totals for the whole run."""
+        buffers = {}
+        for name, cells in self.cells.items():
+            reads = sum(c[0] for c in cells.values())
+            writes = sum(c[1] for c in cells.values())
+            if not reads and not writes:
+                continue
+            buffers[name] = {
+                'cells_touched': len(cells),
+                'reads': reads,
+                'writes': writes,
+                # For a memo a second write means the state was computed
+                # again; in a table it is extra store traffic
+                'repeat_writes': sum(c[1] - 1 for c in cells.values() if c[1] > 1)
+            }
+
+        total_calls = sum(self.calls.values())
+        return {
+            'calls': total_calls,
+            'distinct_states': len(self.calls),
+            'repeated_calls': total_calls - len(self.calls),
+            'most_repeated': [[list(state), count] for state, count in self.calls.most_common(5) if count > 1],
+            'reads': sum(b['reads'] for b in buffers.values()),
+            'writes': sum(b['writes'] for b in buffers.values()),
+            'buffers': buffers,
+            # Row indices of a table that are the same list object
+            'aliased_rows': self.aliases
+        }
+
+    def heatmap(self, source='calls', buffer=None):
+        """
+        Matrix of counts indexed [state][capacity], ready to plot.
+
+        Args:
+            source: 'calls', 'reads' or 'writes'
+            buffer: which buffer to map for reads/writes (defaults to the
+                busiest one); 1D buffers give a single row
+
+        Returns:
+            List of lists of ints (empty if nothing was recorded)
+        """
+        if source == 'calls':
+            counts = dict(self.calls)
+        else:
+            if buffer is None:
+                summary = self.summary()['buffers']
+                if not summary:
+                    return []
+                buffer = max(summary, key=lambda name: summary[name]['reads'] + summary[name]['writes'])
+            column = 0 if source == 'reads' else 1
+            counts = {key: c[column] for key, c in self.cells[buffer].items()}
+
+        points = {}
+        for key, count in counts.items():
+            if not isinstance(key, tuple):
+                key = (0, key)
+            if len(key) == 2 and all(isinstance(k, int) and k >= 0 for k in key):
+                points[key] = count
+        if not points:
+            return []
+
+        rows = max(r for r, _ in points) + 1
+        cols = max(c for _, c in points) + 1
+        matrix = [[0] * cols for _ in range(rows)]
+        for (r, c), count in points.items():
+            matrix[r][c] = count
+        return matrix
+
+
+class TracedRow(list):
+    """
+    List proxy recording element reads and writes.
+
+    Lists stored in it (``dp.append([0] * W)``, ``dp[i] = [...]``) become
+    its traced rows, so a table grown row by row is traced like one built
+    in a single expression; fetching such a row is free.
+    """
+
+    def __init__(self, items, trace, buffer, row=None):
+        super().__init__(items)
+        self._trace = trace
+        self._buffer = buffer
+        self._row = row
+
+    def _key(self, index):
+        if index < 0:
+            index += len(self)
+        return index if self._row is None else (self._row, index)
+
+    def _adopt(self, index, value):
+        """
+        Make a list stored at index one of this buffer's rows.
+
+        Plain lists are wrapped. A TracedRow that is still a buffer of its
+        own (``row = [0] * W; dp.append(row)``) is moved into this one in
+        place, so names bound to it keep seeing the same object.
+        """
+        if type(value) is list:
+            return TracedRow(value, self._trace, self._buffer, index)
+        if type(value) is TracedRow and value._row is None and value._buffer != self._buffer:
+            cells = self._trace.cells[self._buffer]
+            for key, counts in self._trace.cells.pop(value._buffer).items():
+                cells[(index, key)] = counts
+            value._buffer, value._row = self._buffer, index
+        return value
+
+    def __getitem__(self, index):
+        value = super().__getitem__(index)
+        if isinstance(index, int) and not isinstance(value, TracedRow):
+            self._trace.record('read', self._buffer, self._key(index))
+        return value
+
+    def __setitem__(self, index, value):
+        if isinstance(index, int):
+            if index < 0:
+                index += len(self)
+            if isinstance(value, list):
+                super().__setitem__(index, self._adopt(index, value))
+                return
+        super().__setitem__(index, value)
+        if isinstance(index, int):
+            self._trace.record('write', self._buffer, self._key(index))
+
+    def append(self, value):
+        index = len(self)
+        if not isinstance(value, list):
+            super().append(value)
+            self._trace.record('write', self._buffer, self._key(index))
+            return
+        if any(row is value for row in self):
+            # Appending a row that is already in the table aliases it
+            first = next(i for i, row in enumerate(self) if row is value)
+            groups = self._trace.aliases.setdefault(self._buffer, [])
+            group = next((g for g in groups if first in g), None)
+            if group is None:
+                groups.append([first, index])
+            else:
+                group.append(index)
+            super().append(value)
+            return
+        super().append(self._adopt(index, value))
+
+    def extend(self, values):
+        for value in values:
+            self.append(value)
+
+    def __iadd__(self, values):
+        self.extend(values)
+        return self
+
+
+class TracedTable(TracedRow):
+    """
+    List of TracedRow built in one expression (``[[0] * W for ...]``).
+
+    Each distinct row object is wrapped once, so rows that were the same
+    list stay the same TracedRow (their cells are keyed by the first index).
+    """
+
+    def __init__(self, rows, trace, buffer):
+        wrapped = {}
+        indices = {}
+        for i, row in enumerate(rows):
+            if id(row) not in wrapped:
+                wrapped[id(row)] = row if isinstance(row, TracedRow) else TracedRow(row, trace, buffer, i)
+            indices.setdefault(id(row), []).append(i)
+        super().__init__((wrapped[id(row)] for row in rows), trace, buffer)
+
+        shared = [group for group in indices.values() if len(group) > 1]
+        if shared:
+            trace.aliases[buffer] = shared
+
+
+class TracedDict(dict):
+    """Memo proxy: lookups and membership tests count as reads."""
+
+    def __init__(self, items, trace, buffer):
+        super().__init__(items)
+        self._trace = trace
+        self._buffer = buffer
+
+    def __getitem__(self, key):
+        self._trace.record('read', self._buffer, key)
+        return super().__getitem__(key)
+
+    def __contains__(self, key):
+        self._trace.record('read', self._buffer, key)
+        return super().__contains__(key)
+
+    def get(self, key, default=None):
+        self._trace.record('read', self._buffer, key)
+        return super().get(key, default)
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._trace.record('write', self._buffer, key)
+
+
+def _make_wrap(trace):
+    """Build the __trace_wrap__ hook the rewritten source calls."""
+    def wrap(name, value):
+        if isinstance(value, (TracedRow, TracedTable, TracedDict)):
+            return value
+        if type(value) is dict:
+            return TracedDict(value, trace, trace.new_buffer(name))
+        if type(value) is list:
+            if value and all(isinstance(row, list) for row in value):
+                return TracedTable(value, trace, trace.new_buffer(name))
+            return TracedRow(value, trace, trace.new_buffer(name))
+        return value
+    return wrap
+
+
+class _WrapAssignments(ast.NodeTransformer):
+    """
+    Route fresh lists and dicts bound to names through __trace_wrap__:
+    plain and annotated assignments (in functions or at module level),
+    element-wise tuple unpacking, and default argument values.
+    """
+
+    @staticmethod
+    def _is_fresh(value):
+        """Does this expression always build a new list or dict?"""
+        if isinstance(value, (ast.List, ast.ListComp, ast.Dict, ast.DictComp, ast.BinOp)):
+            return True
+        if isinstance(value, ast.Subscript):
+            return isinstance(value.slice, ast.Slice)
+        return (isinstance(value, ast.Call) and isinstance(value.func, ast.Name)
+                and value.func.id in ('list', 'dict'))
+
+    def _wrap(self, name, value):
+        if not self._is_fresh(value):
+            return value
+        return ast.Call(
+            func=ast.Name(id='__trace_wrap__', ctx=ast.Load()),
+            args=[ast.Constant(name), value],
+            keywords=[]
+        )
+
+    def _visit_function(self, node):
+        self.generic_visit(node)
+        args = node.args
+        positional = args.posonlyargs + args.args
+        with_defaults = positional[len(positional) - len(args.defaults):]
+        # def knapsack_memo(..., memo={})
+        args.defaults = [self._wrap(arg.arg, default) for arg, default in zip(with_defaults, args.defaults)]
+        args.kw_defaults = [default if default is None else self._wrap(arg.arg, default)
+                            for arg, default in zip(args.kwonlyargs, args.kw_defaults)]
+        return node
+
+    visit_FunctionDef = _visit_function
+    visit_AsyncFunctionDef = _visit_function
+
+    def visit_Assign(self, node):
+        self.generic_visit(node)
+        names = [t.id for t in node.targets if isinstance(t, ast.Name)]
+        target = node.targets[0]
+        if names:
+            node.value = self._wrap(names[0], node.value)
+        elif (len(node.targets) == 1 and isinstance(target, (ast.Tuple, ast.List))
+                and isinstance(node.value, (ast.Tuple, ast.List))
+                and len(target.elts) == len(node.value.elts)
+                and not any(isinstance(t, ast.Starred) for t in target.elts + node.value.elts)):
+            # prev, curr = [0] * (W + 1), [0] * (W + 1)
+            node.value.elts = [self._wrap(t.id, v) if isinstance(t, ast.Name) else v
+                               for t, v in zip(target.elts, node.value.elts)]
+        return node
+
+    def visit_AnnAssign(self, node):
+        self.generic_visit(node)
+        if node.value is not None and isinstance(node.target, ast.Name):
+            node.value = self._wrap(node.target.id, node.value)
+        return node
+
+
+def trace_source(source, func_name, weights, values, capacity, max_events=10000):
+    """
+    Run one function of a submission with its tables traced.
+
+    Args:
+        source: submission source code
+        func_name: solver to call
+        weights, values, capacity: instance to solve
+        max_events: how many accesses to keep in trace.order
+
+    Returns:
+        (result, AccessTrace)
+    """
+    trace = AccessTrace(max_events)
+    tree = ast.fix_missing_locations(_WrapAssignments().visit(ast.parse(source)))
+    namespace = {'__name__': 'traced_submission', '__trace_wrap__': _make_wrap(trace)}
+    exec(compile(tree, '<traced>', 'exec'), namespace)
+
+    func = namespace[func_name]
+
+    def counted(*args, **kwargs):
+        # The ints in the call are the DP state, e.g. (n, capacity)
+        trace.calls[tuple(a for a in args if type(a) is int)] += 1
+        return func(*args, **kwargs)
+
+    # Recursive calls go through the global name, so they are counted too
+    namespace[func_name] = counted
+
+    # Same signature fallback as knapsack_tests.run_tests
+    try:
+        result = counted(list(weights), list(values), capacity)
+    except TypeError:
+        trace.calls.clear()
+        result = counted(list(weights), list(values), len(weights), capacity)
+    return result, trace
+
+
+def compare_reference(weights=(1, 3, 4, 5), values=(15, 10, 30, 25), capacity=7):
+    """Print trace summaries of every reference solution on one instance."""
+    source = inspect.getsource(engines.reference)
+    names = ['knapsack_recursive', 'knapsack_memo', 'knapsack_tabulation',
+             'knapsack_two_rows', 'knapsack_optimized']
+
+    print(f"{'solution':<20} {'result':>7} {'calls':>7} {'repeats':>8} {'reads':>7} {'writes':>7} {'rep writes':>10}")
+    for name in names:
+        result, trace = trace_source(source, name, weights, values, capacity)
+        s = trace.summary()
+        repeat_writes = sum(b['repeat_writes'] for b in s['buffers'].values())
+        print(f"{name:<20} {result:>7} {s['calls']:>7} {s['repeated_calls']:>8} "
+              f"{s['reads']:>7} {s['writes']:>7} {repeat_writes:>10}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Trace DP table and memo accesses of a submission.')
+    parser.add_argument('submission', nargs='?', help='submission file (omit to compare the reference solutions)')
+    parser.add_argument('-f', '--function', default='knapsack_memo', help='solver to trace')
+    parser.add_argument('--weights', type=int, nargs='+', default=[1, 3, 4, 5])
+    parser.add_argument('--values', type=int, nargs='+', default=[15, 10, 30, 25])
+    parser.add_argument('--capacity', type=int, default=7)
+    parser.add_argument('--heatmap', choices=['calls', 'reads', 'writes'], default='calls')
+    parser.add_argument('--json', help='write summary, heatmap and access order to this file')
+    args = parser.parse_args(argv)
+
+    if not args.submission:
+        compare_reference(args.weights, args.values, args.capacity)
+        return 0
+
+    with open(args.submission, encoding='utf-8') as f:
+        source = f.read()
+    result, trace = trace_source(source, args.function, args.weights, args.values, args.capacity)
+    summary = trace.summary()
+    heatmap = trace.heatmap(args.heatmap)
+
+    print(f'Result: {result}')
+    for buffer, groups in summary['aliased_rows'].items():
+        print(f'Warning: {buffer} has rows that are the same list: {groups}')
+    if not summary['buffers']:
+        print('Warning: no table or memo accesses were traced; only lists and dicts built with a '
+              'literal, comprehension, [x] * n, a slice or list()/dict() and bound to a name are tracked')
+    print(json.dumps(summary, indent=2))
+    if heatmap:
+        print(f'\n{args.heatmap} heatmap (rows: state, columns: capacity)')
+        for row in heatmap:
+            print('  ' + ' '.join(f'{count:>3}' for count in row))
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({
+                'result': result,
+                'summary': summary,
+                'heatmap': heatmap,
+                'order': [[op, buffer, list(key) if isinstance(key, tuple) else key]
+                          for op, buffer, key in trace.order]
+            }, f)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -5,15 +5,46 @@ This module provides comprehensive tests for all knapsack implementations.
 Import your solution functions and run the tests to verify correctness.
 """
 
-def run_tests(knapsack_func):
+import struct
+import sys
+import time
+from array import array
+
+
+def call_solution(knapsack_func, weights, values, capacity):
     """
-    Run test cases on a knapsack function.
+    Call a solution with whichever signature it uses.
     
-    Args:
-        knapsack_func: Function with signature (weights, values, capacity) -> max_value
+    Tries (weights, values, capacity) first, then (weights, values, n, capacity)
+    for the recursive/memo versions.
+    """
+    try:
+        return knapsack_func(weights, values, capacity)
+    except TypeError:
+        return knapsack_func(weights, values, len(weights), capacity)
+
+
+def report_value(actual):
+    """
+    Make a solution's return value safe to report.
+    
+    Plain ints are kept; anything else (None, floats, sets, functions, ...)
+    is shown as its repr so results can always be JSON-encoded and pickled.
+    """
+    if type(actual) is int:
+        return actual
+    try:
+        return repr(actual)
+    except Exception:
+        return f'<unprintable {type(actual).__name__}>'
+
+
+def build_tests():
+    """
+    The built-in test cases.
     
     Returns:
-        List of tuples: (passed, actual_output, expected_output)
+        List of dicts with weights, values, capacity, expected and description
     """
     tests = []
     
@@ -89,40 +120,239 @@ def run_tests(knapsack_func):
         'description': 'Perfect fit: all items combined'
     })
     
-    results = []
-    for i, test in enumerate(tests, 1):
-        try:
-            # Handle different function signatures
-            # Try (weights, values, capacity) first
-            try:
-                actual = knapsack_func(test['weights'], test['values'], test['capacity'])
-            except TypeError:
-                # Try (weights, values, n, capacity) for recursive/memo versions
-                n = len(test['weights'])
-                actual = knapsack_func(test['weights'], test['values'], n, test['capacity'])
-            
-            passed = (actual == test['expected'])
-            results.append({
-                'test_num': i,
-                'description': test['description'],
-                'passed': passed,
-                'actual': actual,
-                'expected': test['expected'],
-                'weights': test['weights'],
-                'values': test['values'],
-                'capacity': test['capacity']
-            })
-        except Exception as e:
-            results.append({
-                'test_num': i,
+    return tests
+
+
+def run_case(knapsack_func, test_num, test):
+    """Run one test case and build its result dict."""
+    result = {
+        'test_num': test_num,
+        'description': test['description'],
+        'passed': False,
+        'actual': None,
+        'expected': test['expected'],
+        'weights': test['weights'],
+        'values': test['values'],
+        'capacity': test['capacity']
+    }
+    try:
+        actual = call_solution(knapsack_func, test['weights'], test['values'], test['capacity'])
+        result['passed'] = bool(actual == test['expected'])
+        result['actual'] = report_value(actual)
+    except Exception as e:
+        result['actual'] = f'ERROR: {str(e)}'
+    return result
+
+
+def run_tests(knapsack_func):
+    """
+    Run test cases on a knapsack function.
+    
+    Args:
+        knapsack_func: Function with signature (weights, values, capacity) -> max_value
+    
+    Returns:
+        List of tuples: (passed, actual_output, expected_output)
+    """
+    return [run_case(knapsack_func, i, test) for i, test in enumerate(build_tests(), 1)]
+
+
+def iter_tests(knapsack_func, stop_on_failure=False, time_budget=None, tests=None):
+    """
+    Run test cases one at a time, yielding each result as soon as it's ready.
+    
+    Cases run from cheapest to most expensive (by n × capacity), so quick
+    verdicts arrive first and a slow case can't hide them.
+    
+    Args:
+        knapsack_func: Function with signature (weights, values, capacity) -> max_value
+        stop_on_failure: stop after the first failing case
+        time_budget: seconds; no new case starts once this much time has passed
+        tests: cases to run (defaults to build_tests())
+    
+    Yields:
+        Result dicts like run_tests(), plus elapsed_ms for the case. Cases
+        cut off by stop_on_failure or time_budget are still yielded, as
+        not passed with skipped set, so every case is always accounted for.
+    """
+    if tests is None:
+        tests = build_tests()
+    order = sorted(
+        range(len(tests)),
+        key=lambda i: (len(tests[i]['weights']) + 1) * (tests[i]['capacity'] + 1)
+    )
+    
+    start = time.perf_counter()
+    stopped = False
+    for i in order:
+        test = tests[i]
+        if not stopped and time_budget is not None and time.perf_counter() - start >= time_budget:
+            stopped = True
+        
+        if stopped:
+            yield {
+                'test_num': i + 1,
                 'description': test['description'],
                 'passed': False,
-                'actual': f'ERROR: {str(e)}',
+                'skipped': True,
+                'actual': None,
                 'expected': test['expected'],
                 'weights': test['weights'],
                 'values': test['values'],
                 'capacity': test['capacity']
-            })
+            }
+            continue
+        
+        case_start = time.perf_counter()
+        result = run_case(knapsack_func, i + 1, test)
+        result['elapsed_ms'] = round((time.perf_counter() - case_start) * 1000, 3)
+        yield result
+        
+        if stop_on_failure and not result['passed']:
+            stopped = True
+
+
+# ==================== BINARY CORPUS ====================
+#
+# Large hidden tests live in a binary file instead of dict literals:
+#
+#   header  magic, version, case count, offset of the case index
+#   data    per case: weights then values, little-endian uint32
+#   index   per case: data offset, n, capacity, expected answer
+#
+# iter_corpus() maps the file and hands out memoryviews into it, so opening
+# a corpus costs the same no matter how many cases it holds and no case is
+# copied until it runs. run_corpus_tests() then hands the solution plain
+# lists, exactly like the built-in tests.
+
+CORPUS_MAGIC = b'KNAPCORP'
+CORPUS_VERSION = 1
+CORPUS_HEADER = struct.Struct('<8sIIQ')
+CORPUS_ENTRY = struct.Struct('<QQQQ')
+
+
+def write_corpus(path, cases):
+    """
+    Write test cases to a binary corpus file.
+    
+    Args:
+        path: output file
+        cases: iterable of dicts with weights, values, capacity, expected
+    
+    Returns:
+        Number of cases written
+    """
+    entries = []
+    with open(path, 'wb') as f:
+        f.write(bytes(CORPUS_HEADER.size))
+        for case in cases:
+            weights = array('I', case['weights'])
+            values = array('I', case['values'])
+            if len(weights) != len(values):
+                raise ValueError('weights and values must have the same length')
+            if sys.byteorder == 'big':
+                weights.byteswap()
+                values.byteswap()
+            
+            entries.append(CORPUS_ENTRY.pack(f.tell(), len(weights), case['capacity'], case['expected']))
+            f.write(weights.tobytes())
+            f.write(values.tobytes())
+        
+        index_offset = f.tell()
+        f.write(b''.join(entries))
+        f.seek(0)
+        f.write(CORPUS_HEADER.pack(CORPUS_MAGIC, CORPUS_VERSION, len(entries), index_offset))
+    return len(entries)
+
+
+def iter_corpus(path):
+    """
+    Yield the cases of a binary corpus without copying them.
+    
+    Args:
+        path: corpus file written by write_corpus()
+    
+    Yields:
+        Dicts with weights and values as read-only memoryviews into the
+        mapped file, plus capacity, expected and description
+    """
+    import mmap
+    
+    with open(path, 'rb') as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(mapped)
+    
+    try:
+        magic, version, count, index_offset = CORPUS_HEADER.unpack_from(view, 0)
+        if magic != CORPUS_MAGIC or version != CORPUS_VERSION:
+            raise ValueError(f'{path} is not a version {CORPUS_VERSION} knapsack corpus')
+        
+        for i in range(count):
+            offset, n, capacity, expected = CORPUS_ENTRY.unpack_from(view, index_offset + i * CORPUS_ENTRY.size)
+            weights = view[offset:offset + 4 * n]
+            values = view[offset + 4 * n:offset + 8 * n]
+            if sys.byteorder == 'little':
+                weights, values = weights.cast('I'), values.cast('I')
+            else:
+                # Big-endian hosts have to copy to swap bytes; frombytes
+                # reads whole uint32s where array('I', view) would take
+                # one element per byte
+                raw_weights, raw_values = weights, values
+                weights, values = array('I'), array('I')
+                weights.frombytes(raw_weights)
+                values.frombytes(raw_values)
+                weights.byteswap()
+                values.byteswap()
+            
+            yield {
+                'weights': weights,
+                'values': values,
+                'capacity': capacity,
+                'expected': expected,
+                'description': f'Corpus case {i + 1}: n={n}, capacity={capacity}'
+            }
+    finally:
+        view.release()
+        try:
+            mapped.close()
+        except BufferError:
+            # A caller still holds a case; the map closes when it's collected
+            pass
+
+
+def run_corpus_tests(knapsack_func, path):
+    """
+    Run a knapsack function on every case of a binary corpus.
+    
+    Args:
+        knapsack_func: Function with signature (weights, values, capacity) -> max_value
+        path: corpus file written by write_corpus()
+    
+    Returns:
+        List of result dicts like run_tests(), with n in place of the
+        (potentially huge) weights and values
+    """
+    results = []
+    for i, case in enumerate(iter_corpus(path), 1):
+        result = {
+            'test_num': i,
+            'description': case['description'],
+            'passed': False,
+            'expected': case['expected'],
+            'n': len(case['weights']),
+            'capacity': case['capacity']
+        }
+        try:
+            # Lists, not memoryviews: solutions may sort, concatenate or
+            # mutate their inputs just as they can in the built-in tests
+            weights = case['weights'].tolist()
+            values = case['values'].tolist()
+            actual = call_solution(knapsack_func, weights, values, case['capacity'])
+            result['passed'] = bool(actual == case['expected'])
+            result['actual'] = report_value(actual)
+        except Exception as e:
+            result['actual'] = f'ERROR: {str(e)}'
+        results.append(result)
     
     return results
 
@@ -140,8 +370,11 @@ def print_results(results):
         status = "✓ PASS" if result['passed'] else "✗ FAIL"
         print(f"\nTest {result['test_num']}: {status}")
         print(f"  {result['description']}")
-        print(f"  Weights:  {result['weights']}")
-        print(f"  Values:   {result['values']}")
+        if 'weights' in result:
+            print(f"  Weights:  {result['weights']}")
+            print(f"  Values:   {result['values']}")
+        else:
+            print(f"  Items:    {result['n']}")
         print(f"  Capacity: {result['capacity']}")
         print(f"  Expected: {result['expected']}")
         print(f"  Actual:   {result['actual']}")
@@ -207,5 +440,7 @@ if __name__ == '__main__':
     print("  from knapsack_starter import knapsack_recursive")
     print("  results = run_tests(knapsack_recursive)")
     print("  print_results(results)")
+    print("\nTo grade a directory of submissions from the repo root:")
+    print("  python -m grader.batch submissions/ -o results.jsonl")
     print("\n" + "!" * 70 + "\n")
 
@@ -42,6 +42,11 @@ interface CodeEditorProps {
   onSwitchToContent: () => void
 }
 
+// No new test case starts after this many seconds. A case that is already
+// running can't be interrupted on Pyodide's thread, so this bounds how long
+// a slow submission keeps starting work rather than the exact run time.
+const TEST_TIME_BUDGET_SECONDS = 10
+
 const CodeEditor = ({
   courseId,
   courseMeta,
@@ -60,6 +65,7 @@ const CodeEditor = ({
   const [loading, setLoading] = useState(false)
   const [showDebug, setShowDebug] = useState(false)
   const [status, setStatus] = useState('Ready')
+  const [stopOnFailure, setStopOnFailure] = useState(true)
   // eslint-disable-next-line @typescript-eslint/no-explicit-any
   const [pyodide, setPyodide] = useState<any>(null)
 
@@ -226,64 +232,68 @@ sys.stdout = StringIO()
       await pyodide.runPythonAsync(testsText)
 
       // Try common function names in order
-      const tryRunTests = `
-try:
-    func_names = ['knapsack_recursive', 'knapsack_memo', 'knapsack_dp', 'knapsack_optimized', 'knapsack']
-    func = None
-    for name in func_names:
-        if name in globals():
-            func = globals()[name]
-            break
-    
-    if func:
-        results = run_tests(func)
-        print("TEST_RESULTS_START")
-        import json
-        print(json.dumps(results))
-        print("TEST_RESULTS_END")
-    else:
-        print("ERROR: No knapsack function found. Define one of: " + ", ".join(func_names))
-except Exception as e:
-    print(f"ERROR: {str(e)}")
+      const findFunc = `
+func_names = ['knapsack_recursive', 'knapsack_memo', 'knapsack_dp', 'knapsack_optimized', 'knapsack']
+func = next((globals()[name] for name in func_names if name in globals()), None)
+func is not None
 `
-      await pyodide.runPythonAsync(tryRunTests)
-      const output = await pyodide.runPythonAsync('sys.stdout.getvalue()')
-      
-      // Parse the output
-      if (output.includes('TEST_RESULTS_START')) {
-        const start = output.indexOf('TEST_RESULTS_START') + 18
-        const end = output.indexOf('TEST_RESULTS_END')
-        const resultsJson = output.substring(start, end).trim()
-        const results = JSON.parse(resultsJson)
-        
-        // Format results nicely
-        let formatted = '═══════════════════════════════════════════════════════\\n'
-        formatted += '                    TEST RESULTS\\n'
-        formatted += '═══════════════════════════════════════════════════════\\n\\n'
-        
-        // eslint-disable-next-line @typescript-eslint/no-explicit-any
-        const passed = results.filter((r: any) => r.passed).length
-        const total = results.length
-        
-        // eslint-disable-next-line @typescript-eslint/no-explicit-any
-        results.forEach((r: any) => {
+      const found = await pyodide.runPythonAsync(findFunc)
+      if (!found) {
+        setOutput('ERROR: No knapsack function found. Define one of: knapsack_recursive, knapsack_memo, knapsack_dp, knapsack_optimized, knapsack')
+        setStatus('Error')
+        return
+      }
+
+      let header = '═══════════════════════════════════════════════════════\\n'
+      header += '                    TEST RESULTS\\n'
+      header += '═══════════════════════════════════════════════════════\\n\\n'
+      let formatted = ''
+      let passed = 0
+      let skipped = 0
+      let total = 0
+      setOutput(header + 'Running...')
+
+      // iter_tests yields each verdict as soon as its case finishes (cheapest
+      // first), so results are shown while the slower cases are still running.
+      // Cases after the first failure (if enabled) or past the time budget
+      // are not run and come back as skipped.
+      const resultsIter = pyodide.runPython(
+        `iter_tests(func, stop_on_failure=${stopOnFailure ? 'True' : 'False'}, time_budget=${TEST_TIME_BUDGET_SECONDS})`
+      )
+      try {
+        for (const proxy of resultsIter) {
+          const r = proxy.toJs({ dict_converter: Object.fromEntries })
+          proxy.destroy()
+
+          total += 1
+          if (r.passed) passed += 1
+          if (r.skipped) {
+            skipped += 1
+            formatted += `Test ${r.test_num}: - SKIPPED\n`
+            formatted += `  ${r.description}\n\n`
+            setOutput(header + formatted)
+            continue
+          }
           const status = r.passed ? '✓ PASS' : '✗ FAIL'
           formatted += `Test ${r.test_num}: ${status}\n`
           formatted += `  ${r.description}\n`
           formatted += `  Capacity: ${r.capacity}, Weights: [${r.weights}], Values: [${r.values}]\n`
           formatted += `  Expected: ${r.expected}, Actual: ${r.actual}\n\n`
-        })
-        
-        formatted += '═══════════════════════════════════════════════════════\n'
-        formatted += `SUMMARY: ${passed}/${total} tests passed\n`
-        formatted += '═══════════════════════════════════════════════════════'
-        
-        setOutput(formatted)
-        setStatus(passed === total ? 'Tests Complete ✓' : 'Tests Complete')
-      } else {
-        setOutput(output)
-        setStatus('Error')
+          setOutput(header + formatted)
+
+          // Let the browser paint this verdict before the next case runs
+          await new Promise((resolve) => setTimeout(resolve, 0))
+        }
+      } finally {
+        resultsIter.destroy()
       }
+
+      formatted += '═══════════════════════════════════════════════════════\n'
+      formatted += `SUMMARY: ${passed}/${total} tests passed${skipped ? ` (${skipped} skipped)` : ''}\n`
+      formatted += '═══════════════════════════════════════════════════════'
+
+      setOutput(header + formatted)
+      setStatus(passed === total ? 'Tests Complete ✓' : 'Tests Complete')
     } catch (err) {
       console.error(err)
       const errorMessage = err instanceof Error ? err.message : String(err)
@@ -386,6 +396,14 @@ except Exception as e:
               >
                 <i className="fas fa-check"></i> Run Tests
               </button>
+              <label className="toolbar-option">
+                <input
+                  type="checkbox"
+                  checked={stopOnFailure}
+                  onChange={(e) => setStopOnFailure(e.target.checked)}
+                />
+                Stop at first failure
+              </label>
             </div>
             
             <div className="editor-workspace">